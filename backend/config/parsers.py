@@ -0,0 +1,29 @@
+import re
+
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.utils import json
+
+# orjson decodes integers outside the 64-bit range as floats, so
+# 99999999999999999999 would arrive as 1e+20. Any run of 19+ digits might be
+# one of those; such bodies go through DRF's stdlib-based decoder instead.
+LONG_DIGIT_RUN = re.compile(rb'\d{19,}')
+
+
+class ORJSONParser(BaseParser):
+    """Drop-in replacement for DRF's JSONParser backed by orjson, which
+    decodes large bulk payloads several times faster than stdlib json."""
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        body = stream.read()
+        if LONG_DIGIT_RUN.search(body):
+            try:
+                return json.loads(body)
+            except ValueError as exc:
+                raise ParseError(f'JSON parse error - {exc}')
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,23 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Drop-in replacement for DRF's JSONRenderer backed by orjson. Types
+    orjson can't handle natively (lazy strings, Decimal, ...) fall back to
+    DRF's own JSONEncoder, and U+2028/U+2029 are escaped the same way.
+
+    Differences from JSONRenderer: any requested indent is rendered as two
+    spaces (the only width orjson supports), and NaN/Infinity become null."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            option |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=option)
+        # Keep the output a strict JavaScript subset, as JSONRenderer does
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
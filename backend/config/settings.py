@@ -39,7 +39,6 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     # Third-party
     'rest_framework',
-    'django_filters',
     'corsheaders',
     # Local
     'professionals',
@@ -134,9 +133,15 @@ CORS_ALLOWED_ORIGINS = [
     'http://localhost:5174',
 ]
 
-# Django REST Framework
+# Django REST Framework — JSON goes through orjson
 REST_FRAMEWORK = {
-    'DEFAULT_FILTER_BACKENDS': [
-        'django_filters.rest_framework.DjangoFilterBackend',
+    'DEFAULT_PARSER_CLASSES': [
+        'config.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
 }
@@ -0,0 +1,142 @@
+"""Merge step of the bulk upsert: decides, for every item of a validated
+batch, whether it creates a record, updates one, or fails — without touching
+the database. Kept free of Django request/ORM calls and fully annotated so it
+can be compiled with mypyc for very large batches (see DESIGN.md); the pure
+Python module is used whenever no compiled build is present."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import Professional
+
+UPSERT_FIELDS = ['full_name', 'email', 'phone', 'company_name', 'job_title', 'source']
+
+# (index, record, snapshot of the record's UPSERT_FIELDS as this item left it)
+Row = Tuple[int, Professional, Dict[str, Any]]
+
+
+def _rekey(
+    record: Professional,
+    old: Optional[str],
+    new: Optional[str],
+    current: Dict[str, Professional],
+    released: Dict[str, Professional],
+) -> None:
+    """Moves `record` from key `old` to `new` in `current`. A key the record
+    moves away from no longer resolves to it, but stays reserved in
+    `released` for the rest of the batch: one bulk write cannot order a
+    hand-over of a unique value between rows."""
+    if old and old != new and current.get(old) is record:
+        del current[old]
+        released[old] = record
+    if new:
+        current[new] = record
+        # Only reached for a record taking back its own released key
+        released.pop(new, None)
+
+
+def _snapshot(record: Professional) -> Dict[str, Any]:
+    return {f: getattr(record, f) for f in UPSERT_FIELDS}
+
+
+def merge(
+    items: List[Any],
+    validated_items: List[Optional[Dict[str, Any]]],
+    child_errors: Dict[int, Any],
+    by_email: Dict[str, Professional],
+    by_phone: Dict[str, Professional],
+) -> Tuple[List[Professional], List[Professional], List[Row], List[Row], List[Dict[str, Any]]]:
+    """Returns (to_create, to_update, created_rows, updated_rows, errors).
+    `by_email` / `by_phone` hold the prefetched records and are kept current
+    as items are merged, so later items in the batch see earlier ones. Each
+    row carries a snapshot of the fields as that item wrote them, since a
+    later item may change the same record again."""
+    released_emails: Dict[str, Professional] = {}
+    released_phones: Dict[str, Professional] = {}
+    to_create: List[Professional] = []
+    to_update: Dict[int, Professional] = {}
+    created_rows: List[Row] = []
+    updated_rows: List[Row] = []
+    errors: List[Dict[str, Any]] = []
+
+    index: int
+    item: Any
+    validated: Optional[Dict[str, Any]]
+    for index, (item, validated) in enumerate(zip(items, validated_items)):
+        if validated is None:
+            errors.append({
+                'index': index,
+                'data': item,
+                'errors': child_errors[index],
+            })
+            continue
+
+        # Determine lookup key
+        email: Optional[str] = validated.get('email')
+        phone: Optional[str] = validated.get('phone')
+
+        if not email and not phone:
+            errors.append({
+                'index': index,
+                'data': item,
+                'errors': {'non_field_errors': ['Either email or phone is required.']},
+            })
+            continue
+
+        # Look up existing record
+        existing: Optional[Professional] = None
+        if email:
+            existing = by_email.get(email)
+        elif phone:
+            existing = by_phone.get(phone)
+
+        # Cross-field conflict: the phone belongs to a different record than
+        # the one the item resolved to (email matched A but phone is B's, or
+        # a new email reuses a taken phone). Both maps are in memory, so the
+        # item is rejected here and never reaches the write.
+        owner: Optional[Professional] = by_phone.get(phone) if phone else None
+        if owner is not None and owner is not existing:
+            errors.append({
+                'index': index,
+                'data': item,
+                'errors': {'phone': ['professional with this phone already exists.']},
+            })
+            continue
+
+        # A key another record gave up earlier in this batch is reserved
+        # until the batch is written
+        released_error: Optional[Dict[str, List[str]]] = None
+        if phone and released_phones.get(phone, existing) is not existing:
+            released_error = {'phone': ['This phone was released by an earlier item in this batch; submit it in a separate request.']}
+        elif email and released_emails.get(email, existing) is not existing:
+            released_error = {'email': ['This email was released by an earlier item in this batch; submit it in a separate request.']}
+        if released_error is not None:
+            errors.append({
+                'index': index,
+                'data': item,
+                'errors': released_error,
+            })
+            continue
+
+        # Queue the create or update
+        professional: Professional
+        old_email: Optional[str] = None
+        old_phone: Optional[str] = None
+        if existing is not None:
+            old_email = existing.email
+            old_phone = existing.phone
+            field: str
+            value: Any
+            for field, value in validated.items():
+                setattr(existing, field, value)
+            if existing.pk is not None:
+                to_update[existing.pk] = existing
+            professional = existing
+            updated_rows.append((index, professional, _snapshot(professional)))
+        else:
+            professional = Professional(**validated)
+            to_create.append(professional)
+            created_rows.append((index, professional, _snapshot(professional)))
+        _rekey(professional, old_email, professional.email, by_email, released_emails)
+        _rekey(professional, old_phone, professional.phone, by_phone, released_phones)
+
+    return to_create, list(to_update.values()), created_rows, updated_rows, errors
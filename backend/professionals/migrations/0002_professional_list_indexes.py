@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 06:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professionals', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='professional',
+            index=models.Index(fields=['-created_at'], name='prof_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='professional',
+            index=models.Index(fields=['source', '-created_at'], name='prof_source_created_at_idx'),
+        ),
+    ]
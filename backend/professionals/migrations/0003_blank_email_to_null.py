@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+def blank_email_to_null(apps, schema_editor):
+    Professional = apps.get_model('professionals', 'Professional')
+    Professional.objects.filter(email='').update(email=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professionals', '0002_professional_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_email_to_null, migrations.RunPython.noop),
+    ]
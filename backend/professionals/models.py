@@ -17,6 +17,10 @@ class Professional(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='prof_created_at_idx'),
+            models.Index(fields=['source', '-created_at'], name='prof_source_created_at_idx'),
+        ]
 
     def __str__(self):
         return self.full_name
@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ProfessionalCursorPagination(CursorPagination):
+    """Pages the list newest first. The cursor seeks on the indexed
+    created_at column, so deep pages cost the same as the first one —
+    unlike OFFSET, which scans every skipped row."""
+
+    ordering = '-created_at'
+    page_size = 100
@@ -11,16 +11,43 @@ class ProfessionalSerializer(serializers.ModelSerializer):
         model = Professional
         fields = '__all__'
 
+    def to_internal_value(self, data):
+        # A blank email means "no email". Store it as NULL, which the unique
+        # email index lets any number of phone-only records share, rather
+        # than '', which only one record could ever hold.
+        if hasattr(data, 'get') and data.get('email') == '':
+            data = data.copy()
+            data['email'] = None
+        return super().to_internal_value(data)
 
-class BulkProfessionalItemSerializer(serializers.ModelSerializer):
+
+class PartialSuccessListSerializer(serializers.ListSerializer):
+    """Validates every item of a bulk payload in one pass without aborting on
+    the first invalid item. `validated_data` keeps one slot per input item
+    (None for invalid ones); the errors are collected in `child_errors` as
+    (index, errors) pairs."""
+
+    def run_validation(self, data):
+        self.child_errors = []
+        validated = []
+        for index, item in enumerate(data):
+            try:
+                validated.append(self.child.run_validation(item))
+            except serializers.ValidationError as exc:
+                validated.append(None)
+                self.child_errors.append((index, exc.detail))
+        return validated
+
+
+class BulkProfessionalItemSerializer(ProfessionalSerializer):
     """Used for each item in the bulk upsert endpoint.
     Removes unique validators on email and phone so that existing records
-    pass validation — uniqueness is handled manually in the upsert logic."""
+    pass validation — uniqueness is handled manually in the upsert logic.
+    Instantiate with many=True: fields are bound once for the whole batch."""
 
-    class Meta:
-        model = Professional
-        fields = '__all__'
+    class Meta(ProfessionalSerializer.Meta):
         extra_kwargs = {
             'email': {'validators': []},
             'phone': {'validators': []},
         }
+        list_serializer_class = PartialSuccessListSerializer
@@ -1,27 +1,30 @@
-import time
+from datetime import timedelta
+from unittest import mock
 
-from django.test import TestCase
-from rest_framework.test import APIClient
+from django.db import IntegrityError, connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
 from rest_framework import status
 
 from .models import Professional
+from .serializers import ProfessionalSerializer
+from .views import BULK_BATCH_SIZE
 
 
-class SingleCreateTests(TestCase):
+class SingleCreateTests(APITestCase):
     """Tests for POST /api/professionals/ — single create endpoint.
     Covers DESIGN.md test cases #1–#10."""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.url = '/api/professionals/'
-        self.valid_data = {
-            'full_name': 'Alice Johnson',
-            'email': 'alice@example.com',
-            'phone': '555-0001',
-            'company_name': 'Acme Corp',
-            'job_title': 'Engineer',
-            'source': 'direct',
-        }
+    url = '/api/professionals/'
+    valid_data = {
+        'full_name': 'Alice Johnson',
+        'email': 'alice@example.com',
+        'phone': '555-0001',
+        'company_name': 'Acme Corp',
+        'job_title': 'Engineer',
+        'source': 'direct',
+    }
 
     # #1 — Valid data, all fields
     def test_create_valid_all_fields(self):
@@ -91,6 +94,13 @@ class SingleCreateTests(TestCase):
         res = self.client.post(self.url, data, format='json')
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
+    def test_create_email_empty_string_stored_as_null(self):
+        """Email as empty string is stored as null, so several phone-only professionals can use it."""
+        for phone in ('555-0101', '555-0102'):
+            res = self.client.post(self.url, {**self.valid_data, 'email': '', 'phone': phone}, format='json')
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            self.assertIsNone(res.data['email'])
+
     def test_create_email_null(self):
         """Email as null → 201 (phone-only professional)."""
         data = {**self.valid_data, 'email': None}
@@ -127,13 +137,17 @@ class SingleCreateTests(TestCase):
         self.assertIsNone(res.data['email'])
 
 
-class BulkUpsertTests(TestCase):
+class BulkUpsertTests(APITestCase):
     """Tests for POST /api/professionals/bulk — bulk upsert endpoint.
     Covers DESIGN.md test cases #11–#23."""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.url = '/api/professionals/bulk'
+    url = '/api/professionals/bulk'
+    # One prefetch SELECT, one upsert INSERT per key group (email-keyed,
+    # phone-only) per bulk_create batch, and the SAVEPOINT / RELEASE of the
+    # write's atomic block inside the test transaction. The constant is for a
+    # single key group that fits in one batch (≈142 rows on SQLite, whose
+    # 999-parameter limit caps each INSERT at 999 // 7 columns).
+    upsert_queries = 4
 
     # #11 — All valid, all new
     def test_all_new_records(self):
@@ -142,7 +156,8 @@ class BulkUpsertTests(TestCase):
             {'full_name': 'A', 'email': 'a@example.com', 'phone': '111', 'source': 'direct'},
             {'full_name': 'B', 'email': 'b@example.com', 'phone': '222', 'source': 'partner'},
         ]
-        res = self.client.post(self.url, data, format='json')
+        with self.assertNumQueries(self.upsert_queries):
+            res = self.client.post(self.url, data, format='json')
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data['created']), 2)
         self.assertEqual(len(res.data['updated']), 0)
@@ -177,13 +192,57 @@ class BulkUpsertTests(TestCase):
             {'full_name': 'Existing Updated', 'email': 'existing@example.com', 'phone': '111', 'source': 'direct'},
             {'full_name': 'Brand New', 'email': 'new@example.com', 'phone': '222', 'source': 'partner'},
         ]
-        res = self.client.post(self.url, data, format='json')
+        with self.assertNumQueries(self.upsert_queries):
+            res = self.client.post(self.url, data, format='json')
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data['created']), 1)
         self.assertEqual(len(res.data['updated']), 1)
         self.assertEqual(res.data['updated'][0]['professional']['full_name'], 'Existing Updated')
         self.assertEqual(res.data['created'][0]['professional']['full_name'], 'Brand New')
 
+    # Query count does not grow with the number of items within one INSERT batch
+    def test_query_count_constant_within_insert_batch(self):
+        """100 new and existing records → same number of queries as a batch of two."""
+        Professional.objects.bulk_create(
+            Professional(full_name=f'P{i}', email=f'p{i}@example.com', phone=str(i), source='direct')
+            for i in range(50)
+        )
+        data = [
+            {'full_name': f'Q{i}', 'email': f'p{i}@example.com', 'phone': str(i), 'source': 'partner'}
+            for i in range(100)
+        ]
+        with self.assertNumQueries(self.upsert_queries):
+            res = self.client.post(self.url, data, format='json')
+        self.assertEqual(len(res.data['updated']), 50)
+        self.assertEqual(len(res.data['created']), 50)
+
+    # One more item than a single INSERT can carry → a second INSERT
+    def test_query_count_just_over_insert_batch(self):
+        """Batch one item larger than the backend's bulk_create cap → exactly one extra INSERT."""
+        fields = [f for f in Professional._meta.concrete_fields if not f.primary_key]
+        cap = min(BULK_BATCH_SIZE, connection.ops.bulk_batch_size(fields, []))
+        data = [
+            {'full_name': f'E{i}', 'email': f'e{i}@example.com', 'phone': str(i), 'source': 'direct'}
+            for i in range(cap + 1)
+        ]
+        with self.assertNumQueries(self.upsert_queries + 1):
+            res = self.client.post(self.url, data, format='json')
+        self.assertEqual(len(res.data['created']), cap + 1)
+
+    # Mixed key groups — one upsert INSERT each
+    def test_query_count_mixed_email_and_phone_only(self):
+        """Email-keyed and phone-only items in one batch → one extra INSERT, still independent of size."""
+        data = [
+            {'full_name': f'E{i}', 'email': f'e{i}@example.com', 'phone': f'1{i}', 'source': 'direct'}
+            for i in range(20)
+        ] + [
+            {'full_name': f'P{i}', 'phone': f'2{i}', 'source': 'partner'}
+            for i in range(20)
+        ]
+        with self.assertNumQueries(self.upsert_queries + 1):
+            res = self.client.post(self.url, data, format='json')
+        self.assertEqual(len(res.data['created']), 40)
+
     # #14 — One invalid among valid (partial success)
     def test_partial_success_one_invalid(self):
         """One invalid among valid → valid ones succeed, invalid in errors[]."""
@@ -197,9 +256,9 @@ class BulkUpsertTests(TestCase):
         self.assertEqual(len(res.data['errors']), 1)
         self.assertEqual(res.data['errors'][0]['index'], 1)
 
-    # #15 — Email matches record A, phone matches record B → IntegrityError
+    # #15 — Email matches record A, phone matches record B → conflict
     def test_cross_field_integrity_error(self):
-        """Email matches A, phone matches B → IntegrityError on save."""
+        """Email matches A, phone matches B → error before any write, A and B untouched."""
         Professional.objects.create(
             full_name='Record A', email='a@example.com', phone='111', source='direct',
         )
@@ -213,8 +272,52 @@ class BulkUpsertTests(TestCase):
         res = self.client.post(self.url, data, format='json')
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data['errors']), 1)
+        self.assertIn('phone', res.data['errors'][0]['errors'])
         self.assertEqual(len(res.data['created']), 0)
         self.assertEqual(len(res.data['updated']), 0)
+        self.assertEqual(Professional.objects.get(phone='111').full_name, 'Record A')
+        self.assertEqual(Professional.objects.get(phone='222').full_name, 'Record B')
+
+    # New email, but phone belongs to an existing record → conflict
+    def test_new_email_with_taken_phone(self):
+        """Unknown email with a phone held by another record → error, others in the batch still succeed."""
+        Professional.objects.create(
+            full_name='Owner', email='owner@example.com', phone='111', source='direct',
+        )
+        data = [
+            {'full_name': 'Taken Phone', 'email': 'new@example.com', 'phone': '111', 'source': 'direct'},
+            {'full_name': 'Fine', 'email': 'fine@example.com', 'phone': '222', 'source': 'direct'},
+        ]
+        res = self.client.post(self.url, data, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['errors']), 1)
+        self.assertEqual(res.data['errors'][0]['index'], 0)
+        self.assertIn('phone', res.data['errors'][0]['errors'])
+        self.assertEqual(len(res.data['created']), 1)
+        self.assertEqual(Professional.objects.count(), 2)
+
+    # Unique clash with a row written concurrently after the prefetch
+    def test_concurrent_integrity_error(self):
+        """IntegrityError on the write → 200, batch rolled back, every queued item in errors[]."""
+        data = [
+            {'full_name': 'A', 'email': 'a@example.com', 'phone': '111', 'source': 'direct'},
+            {'full_name': '', 'phone': '222', 'source': 'direct'},
+            {'full_name': 'C', 'phone': '333', 'source': 'direct'},
+        ]
+        # Both write paths: ON CONFLICT upsert, and bulk_update + bulk_create
+        conflict = IntegrityError('UNIQUE constraint failed: professionals_professional.phone')
+        with (
+            mock.patch('professionals.views._upsert_professionals', side_effect=conflict),
+            mock.patch.object(Professional.objects, 'bulk_create', side_effect=conflict),
+        ):
+            res = self.client.post(self.url, data, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], [])
+        self.assertEqual(res.data['updated'], [])
+        self.assertEqual([error['index'] for error in res.data['errors']], [0, 1, 2])
+        self.assertIn('full_name', res.data['errors'][1]['errors'])
+        self.assertIn('non_field_errors', res.data['errors'][0]['errors'])
+        self.assertEqual(Professional.objects.count(), 0)
 
     # #16 — Phone fallback when no email
     def test_phone_fallback_when_no_email(self):
@@ -248,23 +351,84 @@ class BulkUpsertTests(TestCase):
             {'full_name': 'First', 'email': 'dup@example.com', 'phone': '111', 'source': 'direct'},
             {'full_name': 'Second', 'email': 'dup@example.com', 'phone': '111', 'source': 'direct'},
         ]
-        res = self.client.post(self.url, data, format='json')
+        with self.assertNumQueries(self.upsert_queries):
+            res = self.client.post(self.url, data, format='json')
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data['created']), 1)
         self.assertEqual(len(res.data['updated']), 1)
+        # Each entry shows what that item wrote, on the same record
+        created = res.data['created'][0]['professional']
+        updated = res.data['updated'][0]['professional']
+        self.assertEqual(created['full_name'], 'First')
+        self.assertEqual(updated['full_name'], 'Second')
+        self.assertEqual(created['id'], updated['id'])
         # The final state should be 'Second'
         prof = Professional.objects.get(email='dup@example.com')
         self.assertEqual(prof.full_name, 'Second')
 
+    # Key released earlier in the batch no longer resolves to the old record
+    def test_released_phone_does_not_match_old_record(self):
+        """A moves to a new phone; a later item with A's old phone doesn't update A."""
+        Professional.objects.create(
+            full_name='A', email='a@x.com', phone='777', source='direct',
+        )
+        data = [
+            {'full_name': 'A', 'email': 'a@x.com', 'phone': '999', 'source': 'direct'},
+            {'full_name': 'PhoneOnly', 'phone': '777', 'source': 'direct'},
+        ]
+        res = self.client.post(self.url, data, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['index'] for row in res.data['updated']], [0])
+        self.assertEqual(len(res.data['errors']), 1)
+        self.assertEqual(res.data['errors'][0]['index'], 1)
+        self.assertIn('phone', res.data['errors'][0]['errors'])
+        prof = Professional.objects.get(email='a@x.com')
+        self.assertEqual(prof.phone, '999')
+        self.assertEqual(prof.full_name, 'A')
+        self.assertEqual(Professional.objects.count(), 1)
+
+    def test_released_email_does_not_match_old_record(self):
+        """A drops its email by phone lookup; a later item with A's old email doesn't update A."""
+        Professional.objects.create(
+            full_name='A', email='a@x.com', phone='777', source='direct',
+        )
+        data = [
+            {'full_name': 'A', 'email': None, 'phone': '777', 'source': 'direct'},
+            {'full_name': 'Other', 'email': 'a@x.com', 'phone': '888', 'source': 'direct'},
+        ]
+        res = self.client.post(self.url, data, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['index'] for row in res.data['updated']], [0])
+        self.assertEqual(res.data['errors'][0]['index'], 1)
+        self.assertIn('email', res.data['errors'][0]['errors'])
+        self.assertIsNone(Professional.objects.get(phone='777').email)
+        self.assertEqual(Professional.objects.count(), 1)
+
     # #19 — Empty list
     def test_empty_list(self):
-        """Empty list [] → 200 with empty created/updated/errors."""
-        res = self.client.post(self.url, [], format='json')
+        """Empty list [] → 200 with empty created/updated/errors, no database access."""
+        with self.assertNumQueries(0):
+            res = self.client.post(self.url, [], format='json')
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data['created']), 0)
         self.assertEqual(len(res.data['updated']), 0)
         self.assertEqual(len(res.data['errors']), 0)
 
+    # Malformed JSON body
+    def test_malformed_json(self):
+        """Body that isn't valid JSON → 400 before any processing."""
+        res = self.client.post(self.url, '[{"full_name": ', content_type='application/json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('JSON parse error', res.json()['detail'])
+
+    # Integers beyond 64 bits must not be decoded as floats
+    def test_big_integer_phone_kept_exact(self):
+        """A numeric phone too large for 64 bits is stored digit for digit."""
+        body = '[{"full_name": "N", "phone": 99999999999999999999, "source": "direct"}]'
+        res = self.client.post(self.url, body, content_type='application/json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(Professional.objects.get().phone, '99999999999999999999')
+
     # #20 — Single item in list
     def test_single_item_in_list(self):
         """Single item in list → works like single create but with bulk response format."""
@@ -277,6 +441,42 @@ class BulkUpsertTests(TestCase):
         self.assertEqual(res.data['created'][0]['index'], 0)
         self.assertEqual(res.data['created'][0]['professional']['full_name'], 'Solo')
 
+    # Bulk rows are serialized by hand — keep them identical to the list/create representation
+    def test_response_matches_professional_serializer(self):
+        """created[] and updated[] entries match ProfessionalSerializer output."""
+        Professional.objects.create(
+            full_name='Existing', email='existing@example.com', phone='111', source='direct',
+        )
+        data = [
+            {'full_name': 'Existing Updated', 'email': 'existing@example.com', 'phone': '111', 'source': 'direct'},
+            {'full_name': 'Brand New', 'phone': '222', 'job_title': 'CTO', 'source': 'partner'},
+        ]
+        res = self.client.post(self.url, data, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        updated = res.data['updated'][0]['professional']
+        created = res.data['created'][0]['professional']
+        self.assertEqual(updated, ProfessionalSerializer(Professional.objects.get(pk=updated['id'])).data)
+        self.assertEqual(created, ProfessionalSerializer(Professional.objects.get(pk=created['id'])).data)
+
+    # ?response=minimal — indices only
+    def test_minimal_response(self):
+        """?response=minimal → created[] / updated[] hold indices, errors[] unchanged."""
+        Professional.objects.create(
+            full_name='Existing', email='existing@example.com', phone='111', source='direct',
+        )
+        data = [
+            {'full_name': 'Brand New', 'email': 'new@example.com', 'phone': '222', 'source': 'partner'},
+            {'full_name': '', 'phone': '333', 'source': 'direct'},
+            {'full_name': 'Existing Updated', 'email': 'existing@example.com', 'phone': '111', 'source': 'direct'},
+        ]
+        res = self.client.post(f'{self.url}?response=minimal', data, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], [0])
+        self.assertEqual(res.data['updated'], [2])
+        self.assertEqual(res.data['errors'][0]['index'], 1)
+        self.assertIn('full_name', res.data['errors'][0]['errors'])
+        self.assertEqual(Professional.objects.get(phone='111').full_name, 'Existing Updated')
+
     # #21 — Upsert updates full_name but keeps other fields
     def test_upsert_partial_field_update(self):
         """Upsert updates full_name, other provided fields change, DB state is correct."""
@@ -306,7 +506,7 @@ class BulkUpsertTests(TestCase):
         self.assertEqual(prof.company_name, 'New Co')
         self.assertEqual(prof.job_title, 'Original Title')
 
-    # #22 — No email, phone lookup, but update includes taken email → IntegrityError
+    # #22 — No email, phone lookup, but update includes taken email → conflict
     def test_phone_lookup_with_taken_email(self):
         """Phone lookup succeeds, but updating with an email that belongs to another record → error."""
         Professional.objects.create(
@@ -342,13 +542,11 @@ class BulkUpsertTests(TestCase):
         self.assertEqual(Professional.objects.count(), 0)
 
 
-class ListEndpointTests(TestCase):
+class ListEndpointTests(APITestCase):
     """Tests for GET /api/professionals/ — list endpoint.
     Covers DESIGN.md test cases #24–#28."""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.url = '/api/professionals/'
+    url = '/api/professionals/'
 
     # #24 — No query param returns all
     def test_no_filter_returns_all(self):
@@ -358,7 +556,7 @@ class ListEndpointTests(TestCase):
         Professional.objects.create(full_name='C', phone='333', source='internal')
         res = self.client.get(self.url)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 3)
+        self.assertEqual(len(res.data['results']), 3)
 
     # #25 — ?source=direct returns only direct
     def test_source_filter_direct(self):
@@ -367,31 +565,101 @@ class ListEndpointTests(TestCase):
         Professional.objects.create(full_name='B', phone='222', source='partner')
         res = self.client.get(self.url, {'source': 'direct'})
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0]['source'], 'direct')
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'][0]['source'], 'direct')
 
     # #26 — ?source=invalid returns empty list (lenient filter, not a 400)
     def test_source_filter_invalid_value(self):
         """GET ?source=invalid → 200 with empty list (no match, not an error)."""
         Professional.objects.create(full_name='A', phone='111', source='direct')
-        res = self.client.get(self.url, {'source': 'invalid'})
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url, {'source': 'invalid'})
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 0)
+        self.assertEqual(len(res.data['results']), 0)
 
     # #27 — Empty database
     def test_empty_database(self):
         """GET on empty database returns []."""
         res = self.client.get(self.url)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, [])
+        self.assertEqual(res.data['results'], [])
 
     # #28 — Ordering is newest first
     def test_ordering_newest_first(self):
         """Results are ordered newest first by created_at."""
         p1 = Professional.objects.create(full_name='First', phone='111', source='direct')
-        time.sleep(0.01)  # ensure different timestamps
+        Professional.objects.filter(pk=p1.pk).update(created_at=timezone.now() - timedelta(seconds=1))
         p2 = Professional.objects.create(full_name='Second', phone='222', source='direct')
         res = self.client.get(self.url)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data[0]['full_name'], 'Second')
-        self.assertEqual(res.data[1]['full_name'], 'First')
+        self.assertEqual(res.data['results'][0]['full_name'], 'Second')
+        self.assertEqual(res.data['results'][1]['full_name'], 'First')
+
+    # List rows are built from .values() — keep them identical to the serializer
+    def test_rows_match_professional_serializer(self):
+        """Each listed row matches ProfessionalSerializer output for that professional."""
+        prof = Professional.objects.create(
+            full_name='A', email='a@example.com', phone='111', job_title='CTO', source='direct',
+        )
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [ProfessionalSerializer(prof).data])
+
+    @override_settings(TIME_ZONE='America/New_York')
+    def test_rows_match_professional_serializer_outside_utc(self):
+        """Listed and bulk-returned created_at follow TIME_ZONE like the serializer."""
+        res = self.client.post(
+            '/api/professionals/bulk',
+            [{'full_name': 'B', 'phone': '222', 'source': 'direct'}],
+            format='json',
+        )
+        created = res.data['created'][0]['professional']
+        self.assertEqual(created, ProfessionalSerializer(Professional.objects.get(pk=created['id'])).data)
+        self.assertFalse(created['created_at'].endswith('Z'))
+        res = self.client.get(self.url)
+        self.assertEqual(res.data['results'], [ProfessionalSerializer(Professional.objects.get()).data])
+
+    # Pagination — list is capped per page and continued by cursor
+    def test_pagination_follows_cursor(self):
+        """More rows than the page size → first page is capped, `next` returns the rest."""
+        Professional.objects.bulk_create(
+            Professional(full_name=f'P{i}', phone=str(i), source='direct') for i in range(101)
+        )
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 100)
+        self.assertIsNotNone(res.data['next'])
+        res = self.client.get(res.data['next'])
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertIsNone(res.data['next'])
+
+    # Pagination — rows sharing a created_at across a page boundary
+    def test_pagination_with_tied_timestamps(self):
+        """150 rows with the same created_at → every row appears exactly once across pages."""
+        Professional.objects.bulk_create(
+            Professional(full_name=f'P{i}', phone=str(i), source='direct') for i in range(150)
+        )
+        Professional.objects.update(created_at=timezone.now())
+        ids = []
+        res = self.client.get(self.url)
+        ids += [row['id'] for row in res.data['results']]
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            ids += [row['id'] for row in res.data['results']]
+        self.assertEqual(len(ids), 150)
+        self.assertEqual(len(set(ids)), 150)
+
+    # Rendering — orjson output keeps JSONRenderer's escaping and indent handling
+    def test_line_separators_escaped(self):
+        """U+2028 / U+2029 are written as \\u escapes, not raw bytes."""
+        Professional.objects.create(full_name='A\u2028B\u2029C', phone='111', source='direct')
+        res = self.client.get(self.url)
+        self.assertIn(b'A\\u2028B\\u2029C', res.content)
+        self.assertEqual(res.json()['results'][0]['full_name'], 'A\u2028B\u2029C')
+
+    def test_indent_requested_in_accept_header(self):
+        """Accept: application/json; indent=4 → pretty-printed body."""
+        Professional.objects.create(full_name='A', phone='111', source='direct')
+        res = self.client.get(self.url, HTTP_ACCEPT='application/json; indent=4')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(b'\n  "results"', res.content)
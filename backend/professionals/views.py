@@ -1,25 +1,99 @@
-from django.db import IntegrityError
-from rest_framework import generics, status
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from rest_framework import generics, serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .bulk_upsert_core import UPSERT_FIELDS, merge
 from .models import Professional
+from .pagination import ProfessionalCursorPagination
 from .serializers import BulkProfessionalItemSerializer, ProfessionalSerializer
-from .filters import ProfessionalFilter
+
+BULK_BATCH_SIZE = 500
+VALID_SOURCES = frozenset(Professional.Source.values)
+# Every model column, as ProfessionalSerializer's fields = '__all__' exposes
+LIST_FIELDS = [field.attname for field in Professional._meta.concrete_fields]
+
+
+# Renders created_at exactly as ProfessionalSerializer does, honouring
+# TIME_ZONE and DATETIME_FORMAT
+_datetime_field = serializers.DateTimeField()
+
+
+def _serialize_professional(professional):
+    """Plain-dict equivalent of `ProfessionalSerializer(professional).data`,
+    used for the per-row entries of bulk responses to skip DRF's per-field
+    `to_representation` dispatch."""
+    return {
+        'id': professional.id,
+        'full_name': professional.full_name,
+        'email': professional.email,
+        'phone': professional.phone,
+        'company_name': professional.company_name,
+        'job_title': professional.job_title,
+        'source': professional.source,
+        'created_at': _datetime_field.to_representation(professional.created_at),
+    }
+
+
+def _upsert_professionals(professionals):
+    """Write queued records with INSERT ... ON CONFLICT DO UPDATE, one
+    statement per lookup key (email, or phone for records without one) per
+    bulk_create batch — at most BULK_BATCH_SIZE rows, fewer where the backend
+    caps query parameters (≈142 rows on SQLite).
+    Rows are sent as fresh instances so the insert never carries a pk and
+    never overwrites created_at on existing records; the pk and timestamp
+    of queued creates are copied back onto the queued instances. A create
+    that lands on a row inserted concurrently since the prefetch updates that
+    row, but keeps the Python-side created_at, not the stored one."""
+    for unique_field, group in (
+        ('email', [p for p in professionals if p.email]),
+        ('phone', [p for p in professionals if not p.email]),
+    ):
+        rows = Professional.objects.bulk_create(
+            [Professional(**{f: getattr(p, f) for f in UPSERT_FIELDS}) for p in group],
+            update_conflicts=True,
+            unique_fields=[unique_field],
+            update_fields=[f for f in UPSERT_FIELDS if f != unique_field],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        for professional, row in zip(group, rows):
+            if professional.pk is None:
+                professional.pk = row.pk
+                professional.created_at = row.created_at
 
 
 class ProfessionalListCreateView(generics.ListCreateAPIView):
-    """GET /api/professionals/ — list all (with optional ?source= filter)
+    """GET /api/professionals/ — list all, cursor-paginated (with optional ?source= filter)
     POST /api/professionals/ — create a single professional"""
 
-    queryset = Professional.objects.all()
     serializer_class = ProfessionalSerializer
-    filterset_class = ProfessionalFilter
+    pagination_class = ProfessionalCursorPagination
+
+    def get_queryset(self):
+        queryset = Professional.objects.all()
+        source = self.request.query_params.get('source')
+        if not source:
+            return queryset
+        if source not in VALID_SOURCES:
+            # An unknown source can't match any row, so skip the query
+            return queryset.none()
+        return queryset.filter(source=source)
+
+    def list(self, request, *args, **kwargs):
+        # Pages are read as plain rows: no model instances, no serializer
+        queryset = self.filter_queryset(self.get_queryset()).values(*LIST_FIELDS)
+        page = self.paginate_queryset(queryset)
+        # Format into copies: the paginator builds the next/previous cursors
+        # from the raw created_at values of these rows
+        rows = [{**row, 'created_at': _datetime_field.to_representation(row['created_at'])} for row in page]
+        return self.get_paginated_response(rows)
 
 
 class ProfessionalBulkUpsertView(APIView):
     """POST /api/professionals/bulk — bulk upsert with partial success.
-    Uses email as the primary lookup key, falls back to phone if no email."""
+    Uses email as the primary lookup key, falls back to phone if no email.
+    With ?response=minimal, created[] and updated[] list item indices only."""
 
     def post(self, request):
         if not isinstance(request.data, list):
@@ -27,65 +101,78 @@ class ProfessionalBulkUpsertView(APIView):
                 {'detail': 'Expected a list of professional objects.'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if not request.data:
+            return Response({'created': [], 'updated': [], 'errors': []}, status=status.HTTP_200_OK)
+
+        # Step 1: Validate all items in a single pass
+        serializer = BulkProfessionalItemSerializer(data=request.data, many=True)
+        serializer.is_valid()
+        child_errors = dict(serializer.child_errors)
+
+        # Step 2: Fetch every existing record the batch could match up front,
+        # so lookups inside the loop are dict hits rather than queries. Full
+        # rows are needed: updates keep the fields an item omits, and the
+        # response echoes every field, so deferred columns would be loaded
+        # again one row at a time.
+        validated_items = [v for v in serializer.validated_data if v is not None]
+        emails = {v['email'] for v in validated_items if v.get('email')}
+        phones = {v['phone'] for v in validated_items if v.get('phone')}
+        # One query for both keys; a row matching on both lands in both maps
+        # as the same instance, so every item touching it mutates one object.
+        by_email = {}
+        by_phone = {}
+        for p in Professional.objects.filter(Q(email__in=emails) | Q(phone__in=phones)):
+            if p.email in emails:
+                by_email[p.email] = p
+            if p.phone in phones:
+                by_phone[p.phone] = p
 
-        created = []
-        updated = []
-        errors = []
-
-        for index, item in enumerate(request.data):
-            # Step 1: Validate fields
-            serializer = BulkProfessionalItemSerializer(data=item)
-            if not serializer.is_valid():
-                errors.append({
-                    'index': index,
-                    'data': item,
-                    'errors': serializer.errors,
-                })
-                continue
-
-            validated = serializer.validated_data
-
-            # Step 2: Determine lookup key
-            email = validated.get('email')
-            phone = validated.get('phone')
-
-            if not email and not phone:
-                errors.append({
-                    'index': index,
-                    'data': item,
-                    'errors': {'non_field_errors': ['Either email or phone is required.']},
-                })
-                continue
-
-            # Step 3: Look up existing record
-            existing = None
-            if email:
-                existing = Professional.objects.filter(email=email).first()
-            elif phone:
-                existing = Professional.objects.filter(phone=phone).first()
-
-            # Step 4: Create or update
-            try:
-                if existing:
-                    for field, value in validated.items():
-                        setattr(existing, field, value)
-                    existing.save()
-                    updated.append({
-                        'index': index,
-                        'professional': ProfessionalSerializer(existing).data,
-                    })
+        # Steps 3–5: Match each item to a record and queue the write
+        to_create, to_update, created_rows, updated_rows, errors = merge(
+            request.data, serializer.validated_data, child_errors, by_email, by_phone,
+        )
+
+        # Step 6: Write the whole batch. Where the database can upsert on a
+        # unique column, a record created concurrently since the prefetch with
+        # the same email (or phone, for phone-only items) is updated instead
+        # of failing; that item is still reported in created[], with the
+        # created_at Django assigned for the insert rather than the stored
+        # row's. A concurrent clash on the other unique column still raises
+        # IntegrityError; the batch is then rolled back as a whole and every
+        # queued item is reported as an error.
+        try:
+            with transaction.atomic():
+                if connection.features.supports_update_conflicts_with_target:
+                    _upsert_professionals([*to_update, *to_create])
                 else:
-                    new_professional = Professional.objects.create(**validated)
-                    created.append({
-                        'index': index,
-                        'professional': ProfessionalSerializer(new_professional).data,
-                    })
-            except IntegrityError as e:
-                errors.append({
-                    'index': index,
-                    'data': item,
-                    'errors': {'non_field_errors': [str(e)]},
-                })
+                    Professional.objects.bulk_update(
+                        to_update, fields=UPSERT_FIELDS, batch_size=BULK_BATCH_SIZE,
+                    )
+                    Professional.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+        except IntegrityError as e:
+            message = f'Batch not saved: conflicted with a concurrent change ({e}). Retry the request.'
+            queued = sorted({index for index, _, _ in [*created_rows, *updated_rows]})
+            errors.extend(
+                {'index': index, 'data': request.data[index], 'errors': {'non_field_errors': [message]}}
+                for index in queued
+            )
+            errors.sort(key=lambda error: error['index'])
+            created_rows = updated_rows = []
+
+        if request.query_params.get('response') == 'minimal':
+            created = [index for index, _, _ in created_rows]
+            updated = [index for index, _, _ in updated_rows]
+        else:
+            # The record supplies id and created_at; the snapshot has the
+            # fields as this item wrote them
+            created = [
+                {'index': index, 'professional': {**_serialize_professional(professional), **snapshot}}
+                for index, professional, snapshot in created_rows
+            ]
+            updated = [
+                {'index': index, 'professional': {**_serialize_professional(professional), **snapshot}}
+                for index, professional, snapshot in updated_rows
+            ]
 
         return Response({
             'created': created,
@@ -1,8 +1,11 @@
 import { apiCall } from './client';
 
-export function fetchProfessionals(source) {
-  const params = source ? `?source=${source}` : '';
-  return apiCall(`/professionals/${params}`);
+export function fetchProfessionals(source, cursor) {
+  const params = new URLSearchParams();
+  if (source) params.set('source', source);
+  if (cursor) params.set('cursor', cursor);
+  const query = params.toString();
+  return apiCall(`/professionals/${query ? `?${query}` : ''}`);
 }
 
 export function createProfessional(data) {
@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { useQuery } from '@tanstack/react-query';
+import { useInfiniteQuery } from '@tanstack/react-query';
 import { fetchProfessionals } from '../api/professionals';
 
 const SOURCE_OPTIONS = [
@@ -12,10 +12,15 @@ const SOURCE_OPTIONS = [
 export default function ProfessionalsList() {
   const [source, setSource] = useState('');
 
-  const { data: professionals, isLoading, error } = useQuery({
-    queryKey: ['professionals', source],
-    queryFn: () => fetchProfessionals(source),
-  });
+  const { data, isLoading, error, fetchNextPage, hasNextPage, isFetchingNextPage } =
+    useInfiniteQuery({
+      queryKey: ['professionals', source],
+      queryFn: ({ pageParam }) => fetchProfessionals(source, pageParam),
+      initialPageParam: null,
+      getNextPageParam: (lastPage) =>
+        lastPage.next ? new URL(lastPage.next).searchParams.get('cursor') : undefined,
+    });
+  const professionals = data?.pages.flatMap((page) => page.results);
 
   return (
     <div>
@@ -118,6 +123,19 @@ export default function ProfessionalsList() {
           </table>
         </div>
       )}
+
+      {hasNextPage && (
+        <div className="mt-4 text-center">
+          <button
+            type="button"
+            onClick={() => fetchNextPage()}
+            disabled={isFetchingNextPage}
+            className="rounded-md border border-gray-300 bg-white px-4 py-2 text-sm font-medium text-gray-700 shadow-sm hover:bg-gray-50 disabled:opacity-50"
+          >
+            {isFetchingNextPage ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }